@@ -1,78 +1,390 @@
 import os
 import csv
 import traceback
+import threading
 import time
+from operator import attrgetter
+from collections import OrderedDict
+from contextlib import closing, contextmanager
 
-from ij import IJ, WindowManager
+from ij import IJ, ImagePlus, Prefs, WindowManager
 from ij.gui import ImageCanvas, ImageWindow, OvalRoi, Overlay
 from ij.plugin.frame import RoiManager
 from ij.measure import ResultsTable, Measurements
-from ij.plugin.filter import ParticleAnalyzer
+from ij.io import FileSaver
+from ij.plugin.filter import ParticleAnalyzer, EDM
+from ij.process import ImageProcessor
 
 
-from java.io import File, IOException
-from java.nio.file import Files, StandardCopyOption, Paths
+from java.io import File, IOException, BufferedReader, InputStreamReader, FileInputStream
+from java.nio.file import Files, StandardCopyOption, Paths, AtomicMoveNotSupportedException
 from java.beans import PropertyChangeListener
-from java.lang import Runnable, System
+from java.lang import Runnable, System, Long
+from java.util import ArrayList, Arrays
+from java.util.concurrent import Executors, Callable, LinkedBlockingQueue, TimeUnit
 
 from javax.swing import (JFrame, JDialog, JMenuBar, JMenu, JMenuItem, JSplitPane,
                          JPanel, JComboBox, JScrollPane, JOptionPane, JTree, JTable,
                          JButton, JLabel, JFileChooser, ListSelectionModel, BorderFactory,
                          JTextField, JList, JCheckBox, DefaultListModel,
-                         SwingWorker, JProgressBar, ProgressMonitor, SwingUtilities)
-from javax.swing.table import AbstractTableModel, DefaultTableModel
+                         SwingWorker, JProgressBar, ProgressMonitor, SwingUtilities, Timer)
+from javax.swing.table import AbstractTableModel
 from javax.swing.tree import DefaultMutableTreeNode, DefaultTreeModel
-from javax.swing.event import ListSelectionListener, ListDataListener
+from javax.swing.event import ListSelectionListener, ListDataListener, TreeWillExpandListener
 from javax.swing.border import EmptyBorder
 from javax.swing.filechooser import FileNameExtensionFilter
 
 from java.awt import BorderLayout, FlowLayout, Font, GridLayout, Cursor
 from java.awt.event import WindowAdapter, MouseAdapter, KeyListener
 
+# Buffer size (bytes) used when reading and writing the project csv databases
+CSV_BUFSIZE = 256 * 1024
+
+_SEP = os.sep
+
+# ilastik4ij prediction commands
+_ILASTIK_PIXEL_CMD = "Run Pixel Classification Prediction"
+_ILASTIK_OBJECT_CMD = "Run Object Classification Prediction"
+
+# Queued after the last ROI result to tell the results writer thread to finish
+_END_OF_RESULTS = object()
+
+# Image file extensions, matched against the lower-cased extension of each file
+_IMAGE_EXTS = frozenset(('.tif', '.tiff', '.jpg', '.jpeg'))
+
+# ROI and image status values repeated across every entry; one shared string object each
+_NA = 'N/A'
+_FROM_FILE = 'From File'
+_NEW = 'New'
+_UNTRACKED = 'Untracked'
+_DEFINED = 'Defined'
+_MODIFIED = 'Modified'
+
+# Column headers of the project csv databases
+_ROI_DB_HEADERS = ['filename', 'roi_name', 'bregma', 'status']
+_STATUS_DB_HEADERS = ['filename', 'status']
+_RESULTS_DB_HEADERS = ['filename', 'roi_name', 'roi_area', 'brema_value', 'cell_count', 'total_cell_area']
+
+# Fonts and borders are immutable, so windows that open repeatedly share one instance of each
+_HEADER_FONT = Font("SansSerif", Font.BOLD, 16)
+_PAD5 = EmptyBorder(5, 5, 5, 5)
+_PAD10 = EmptyBorder(10, 10, 10, 10)
+_PAD15 = EmptyBorder(15, 15, 15, 15)
+_TB_IMAGES = BorderFactory.createTitledBorder("Project Images")
+_TB_ROI_DETAILS = BorderFactory.createTitledBorder("ROI Details (Editable)")
+_TB_ROIS = BorderFactory.createTitledBorder("ROIs")
+_TB_EDIT = BorderFactory.createTitledBorder("Edit Selected ROI")
+_TB_OPTIONS = BorderFactory.createTitledBorder("Processing Options")
+
 #==============================================
 # Project structure and file managment
 #==============================================
 
+def _list_dir_names(dir_path):
+    """ Returns the names of all entries in a directory from one java.nio directory stream, or [] if it can't be read """
+    names = []
+    try:
+        stream = Files.newDirectoryStream(Paths.get(dir_path))
+    except IOException:
+        return names
+    try:
+        for entry in stream:
+            names.append(entry.getFileName().toString())
+    finally:
+        stream.close()
+    return names
+
+def _read_csv_rows(path):
+    """
+    Yields the rows of a csv database as lists of strings, skipping the header and blank lines.
+    Lines are decoded as UTF-8 (the encoding _csv_line writes) by a java BufferedReader and split on commas. Quoted fields can hold commas
+    or line breaks, so once a line with a quote turns up the rest of the file goes to csv.reader.
+    """
+    reader = BufferedReader(InputStreamReader(FileInputStream(path), "UTF-8"), CSV_BUFSIZE)
+    try:
+        reader.readLine() # skip header
+        line = reader.readLine()
+        while line is not None:
+            if '"' in line:
+                for row in csv.reader(_iter_remaining_lines(line, reader)):
+                    if row:
+                        yield row
+                return
+            if line:
+                yield line.split(',')
+            line = reader.readLine()
+    finally:
+        reader.close()
+
+def _csv_has_rows(path, headers):
+    """ True if a csv database exists and holds more than its header line, checked without opening it """
+    try:
+        return os.path.getsize(path) > len(_csv_line(headers))
+    except OSError:
+        return False
+
+def _iter_remaining_lines(first_line, reader):
+    """ Yields first_line then every following line of a BufferedReader, with the line break put back """
+    line = first_line
+    while line is not None:
+        yield line + '\n'
+        line = reader.readLine()
+
+def _csv_escape(value):
+    """ Quotes a csv field only if it holds a delimiter, quote or line break, like csv.writer does """
+    if ',' in value or '"' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def _csv_line(fields):
+    """ Formats one csv record as UTF-8 bytes, with csv.writer's default line terminator """
+    return ','.join([_csv_escape(_utf8(field)) for field in fields]) + '\r\n'
+
+def _utf8(value):
+    """ Encodes unicode (e.g. values read back by _read_csv_rows) to UTF-8, byte strings pass through """
+    return value if isinstance(value, str) else value.encode('utf-8')
+
+def _replace_file(tmp_path, path):
+    """ Moves a fully written temp file over path, atomically where the filesystem supports it """
+    source, target = Paths.get(tmp_path), Paths.get(path)
+    try:
+        Files.move(source, target, StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE)
+    except AtomicMoveNotSupportedException:
+        Files.move(source, target, StandardCopyOption.REPLACE_EXISTING)
+
+def _sync_to_disk(f):
+    """ Flushes a file object and fsyncs it, so its contents are on disk before it replaces anything """
+    f.flush()
+    os.fsync(f.fileno())
+
+def _discard_tmp_file(tmp_path):
+    """ Removes a leftover temp file after a failed write, ignoring errors """
+    try:
+        Files.deleteIfExists(Paths.get(tmp_path))
+    except IOException:
+        pass
+
+# Hidden RoiManager shared by all ProjectImages for reading ROI zips. Hidden managers are never
+# registered as the ImageJ instance, so this can't interfere with a RoiManager the user has open.
+_shared_roi_manager = None
+_roi_manager_lock = threading.Lock()
+
+def _get_roi_manager():
+    """ Returns the shared hidden RoiManager, creating it on first use. Callers must hold _roi_manager_lock """
+    global _shared_roi_manager
+    if _shared_roi_manager is None:
+        _shared_roi_manager = RoiManager(True)
+    return _shared_roi_manager
+
+# Guards the check-and-install of an image's ROI list, which the GUI thread and pool threads can race on
+_roi_install_lock = threading.Lock()
+
+# Per-thread hidden RoiManagers for the pool threads of Project.populate_missing_rois
+_thread_roi_managers = threading.local()
+
+def _get_thread_roi_manager():
+    """ Returns a hidden RoiManager owned by the calling thread, so pool threads never share one """
+    rm = getattr(_thread_roi_managers, 'rm', None)
+    if rm is None:
+        rm = _thread_roi_managers.rm = RoiManager(True)
+    return rm
+
+def _read_roi_names(rm, roi_path):
+    """ Opens an ROI zip in the given RoiManager and returns the ROI names in order """
+    rm.reset()
+    rm.open(roi_path)
+    return [roi.getName() for roi in rm.getRoisAsArray()]
+
+def _read_rois_by_name(rm, roi_path):
+    """ Opens an ROI zip in the given RoiManager and returns {name: Roi}, the first ROI winning on repeated names """
+    rm.reset()
+    rm.open(roi_path)
+    rois_by_name = {}
+    for roi in rm.getRoisAsArray():
+        rois_by_name.setdefault(roi.getName(), roi)
+    rm.reset()
+    return rois_by_name
+
+# roi_path -> (mtime, ROI names), so re-opening a project doesn't re-read unchanged zips
+_roi_name_cache = {}
+
+def _load_roi_names(roi_path, rm=None):
+    """
+    Returns the ROI names in an ROI zip, from the cache if the file hasn't changed since it was read.
+    rm is a RoiManager owned by the calling thread, if not given the shared one is used under its lock.
+    """
+    try:
+        mtime = os.path.getmtime(roi_path)
+    except OSError:
+        return () # zip removed since the ROI folder was listed
+    cached = _roi_name_cache.get(roi_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    if rm is None:
+        # Reuse the shared hidden manager; the lock stops the GUI and a worker thread using it at once
+        with _roi_manager_lock:
+            roi_names = _read_roi_names(_get_roi_manager(), roi_path)
+    else:
+        roi_names = _read_roi_names(rm, roi_path)
+    roi_names = tuple(roi_names)
+    _roi_name_cache[roi_path] = (mtime, roi_names)
+    return roi_names
+
+class _RoiZipTask(Callable):
+    """ Pool task reading one image's ROI zip with the worker thread's own RoiManager """
+    def __init__(self, image):
+        self.image = image
+
+    def call(self):
+        self.image.populate_rois_from_zip(_get_thread_roi_manager())
+        return None
+
+class _RepeatLogger(object):
+    """
+    Writes the first message of each kind to the ImageJ log and only counts the repeats, so a failure
+    that hits every ROI of a batch (a bad model path, say) logs one line plus a summary, not one per ROI.
+    """
+    def __init__(self):
+        self._counts = OrderedDict() # kind -> times seen
+        self._lock = threading.Lock()
+
+    def log(self, kind, message):
+        with self._lock:
+            seen = self._counts.get(kind, 0)
+            self._counts[kind] = seen + 1
+        if not seen:
+            IJ.log(message)
+
+    def flush(self):
+        """ Logs how often each message was repeated since the last flush, and starts counting afresh """
+        with self._lock:
+            repeats = [(kind, seen - 1) for kind, seen in self._counts.items() if seen > 1]
+            self._counts.clear()
+        for kind, times in repeats:
+            IJ.log("(the error '{}' was repeated {} more times)".format(kind, times))
+
+class _OpenImageTask(Callable):
+    """ Pool task opening an image from disk so the next one can load while the current one is processed """
+    def __init__(self, path):
+        self.path = path
+
+    def call(self):
+        return IJ.openImage(self.path)
+
+class _FinalizeImageTask(Runnable):
+    """ Pool task running QuantificationWorker._finalize_image for one finished image """
+    def __init__(self, worker, imp, name):
+        self.worker = worker
+        self.imp = imp
+        self.name = name
+
+    def run(self):
+        self.worker._finalize_image(self.imp, self.name)
+
+class RoiRecord(object):
+    """ Details of a single ROI. Slots keep entries small; fields are edited in place by the GUI """
+    __slots__ = ('roi_name', 'bregma', 'status')
+
+    def __init__(self, roi_name, bregma, status):
+        self.roi_name = roi_name
+        self.bregma = bregma
+        self.status = status
+
 class ProjectImage(object):
     """ Simple class to hold info about a single image file """
-    def __init__(self, filename, project_path):
+    __slots__ = ('filename', 'full_path', 'roi_path', '_has_roi', '_sort_key',
+                 'rois', '_roi_index', '_rois_loaded', 'status')
+
+    def __init__(self, filename, images_dir, rois_dir, roi_files=None):
         self.filename = filename
-        self.full_path = os.path.join(project_path, "Images", filename)
+        self.full_path = images_dir + _SEP + filename
+
+        base_name, _ = os.path.splitext(filename)
+        roi_filename = base_name + "_ROIs.zip"
+        self.roi_path = rois_dir + _SEP + roi_filename
+
+        # Whether the ROI zip exists, from a listing of the ROI folder if given, otherwise stat'd on first use
+        self._has_roi = roi_filename in roi_files if roi_files is not None else None
+
+        # Natural sort key computed once: leading number of the filename, then the filename for ties
+        try:
+            self._sort_key = (int(filename.split('_', 1)[0]), filename)
+        except ValueError:
+            self._sort_key = (float('inf'), filename)
+
+        self.rois = [] # list of RoiRecord objects
+        self._roi_index = {} # roi_name -> RoiRecord, kept in step with self.rois
+        self._rois_loaded = False
+        self.status = _NEW
 
-        base_name, _ = os.path.splitext(self.filename)
-        self.roi_path = os.path.join(project_path, "ROI_Files", base_name + "_ROIs.zip")
-        self.rois = [] # list of dictionaries
-        self.status = "New" 
+    @property
+    def rois_loaded(self):
+        """ True once the ROI list is known, either from the DB or from the ROI zip """
+        return self._rois_loaded or bool(self.rois)
 
     def has_roi(self):
-        """ Checks if corrosponding ROI file exists """
-        return os.path.exists(self.roi_path)
+        """ Checks if corrosponding ROI file exists. Cached, call refresh_has_roi after writing the zip """
+        if self._has_roi is None:
+            self._has_roi = os.path.exists(self.roi_path)
+        return self._has_roi
+
+    def refresh_has_roi(self):
+        """ Re-checks the disk for the ROI file """
+        self._has_roi = os.path.exists(self.roi_path)
+        return self._has_roi
     
     def add_roi(self, roi_data):
         """ Adds an ROI's data to the image"""
         self.rois.append(roi_data)
+        # first entry wins for duplicate names, as the old linear scans did
+        self._roi_index.setdefault(roi_data.roi_name, roi_data)
+
+    def set_rois(self, rois):
+        """ Replaces the image's ROI list and rebuilds the name index, swapping both in once they're complete """
+        new_rois = list(rois)
+        new_index = {}
+        for roi_data in new_rois:
+            new_index.setdefault(roi_data.roi_name, roi_data) # first entry wins, as in add_roi
+        self._roi_index = new_index
+        self.rois = new_rois
+
+    def get_roi(self, roi_name):
+        """ Returns the RoiRecord with the given name, or None """
+        return self._roi_index.get(roi_name)
+
+    def rename_roi(self, roi_data, new_name):
+        """ Renames an ROI, moving its entry in the name index """
+        if self._roi_index.get(roi_data.roi_name) is roi_data:
+            del self._roi_index[roi_data.roi_name]
+        roi_data.roi_name = new_name
+        self._roi_index.setdefault(new_name, roi_data)
+
+    def remove_roi(self, roi_name):
+        """ Removes the ROI with the given name, found through the name index """
+        roi_data = self._roi_index.pop(roi_name, None)
+        if roi_data is not None:
+            self.rois.remove(roi_data) # RoiRecord has no __eq__, so this matches by identity
+
+    def populate_rois_from_zip(self, rm=None):
+        """
+        Populate roi names from a zip file for images where the roi list in the DB is empty.
+        Called on demand the first time an image's ROIs are needed; the zip is only read once.
+        rm is a hidden RoiManager owned by the calling thread, if not given the shared one is used.
+        """
+        if self.rois_loaded:
+            return
 
-    def populate_rois_from_zip(self):
-        """ Populate roi names from a zip file for images where the roi list in the DB is empty """
-        if self.has_roi() and not self.rois:
-            # Hidden, non-interactive ROIManager to read files
-            rm = RoiManager(True)
-            try:
-                rm.open(self.roi_path)
-                rois_array = rm.getRoisAsArray()
-
-                # clear empty entries before populating
-                self.rois = []
-
-                for roi in rois_array:
-                    self.rois.append({
-                        'roi_name': roi.getName(),
-                        'bregma': 'N/A',
-                        'status': 'From File'
-                    })
-            finally:
-                # ensure manager is closed
-                rm.close()
+        records = []
+        if self.has_roi():
+            records = [RoiRecord(name, _NA, _FROM_FILE) for name in _load_roi_names(self.roi_path, rm)]
+
+        # Only flagged as loaded once the list is in place. If another thread got there first,
+        # keep its list: the ROI details table may already be showing it.
+        with _roi_install_lock:
+            if not self.rois_loaded:
+                self.set_rois(records)
+                self._rois_loaded = True
 
 class Project(object):
     """ Class representing a project, holding its structure and data once opened from folder """
@@ -81,43 +393,44 @@ class Project(object):
         self.name = os.path.basename(os.path.normpath(root_dir))
         self.paths = self._discover_paths()
         self._verify_and_create_dirs()
+        # (name, path, is_dir) shown in the GUI file tree: directorys and key files, checked once here
+        self.tree_entries = []
+        for name, path in self.paths.items():
+            is_dir = os.path.isdir(path)
+            if is_dir or name.endswith('_db'):
+                self.tree_entries.append((os.path.basename(path), path, is_dir))
         self.images = [] # list of ProjectImage objects
-        self._load_project_db()
-        self._scan_for_new_images()
-        self.images.sort(key=self._get_natural_sort_key)
+        self._by_filename = {} # filename -> ProjectImage, kept in step with self.images
+        self._dirty = False # True when memory holds changes the DB files don't have yet
+        self._roi_files = set() # names in the ROI folder when the project was opened
+        self._build_index()
 
-    def _get_natural_sort_key(self, image_object):
-        """ correctly sorts filenames by extracting leading number """
-        try:
-            return int(image_object.filename.split('_')[0])
-        except (ValueError, IndexError):
-            return float('inf')
-        
     def _verify_and_create_dirs(self):
         """ Check for essential project files and creates them if missing"""
         for key, path in self.paths.items():
-            if not os.path.exists(path):
-                try:
-                    # For csv databases
-                    if path.endswith(".csv"):
-                        headers = []
-                        if key == 'roi_db':
-                            headers = ['filename', 'roi_name', 'bregma', 'status']
-                        elif key == 'image_status_db': 
-                            headers = ['filename', 'status']
-                        elif key == 'results_db':
-                            headers = ['filename', 'roi_name', 'roi_area', 'brema_value', 'cell_count', 'total_cell_area' ]
-
-                        if headers:
-                            with open(path, 'w') as csvfile:
-                                writer = csv.writer(csvfile)
-                                writer.writerow(headers)
-                                IJ.log("Created missing project database: {}".format(path))
-                    else:
-                        os.makedirs(path)
-                        IJ.log("Created missing project directory: {}".format(path))
-                except OSError as e:
-                    IJ.log("Error creating directory {}: {}".format(path, e))
+            try:
+                # For csv databases
+                if key.endswith('_db'):
+                    if os.path.exists(path):
+                        continue
+                    headers = []
+                    if key == 'roi_db':
+                        headers = _ROI_DB_HEADERS
+                    elif key == 'image_status_db': 
+                        headers = _STATUS_DB_HEADERS
+                    elif key == 'results_db':
+                        headers = _RESULTS_DB_HEADERS
+
+                    if headers:
+                        with open(path, 'w') as csvfile:
+                            writer = csv.writer(csvfile)
+                            writer.writerow(headers)
+                            IJ.log("Created missing project database: {}".format(path))
+                else:
+                    # No-op for directories that already exist, so no separate exists check is needed
+                    Files.createDirectories(Paths.get(path))
+            except (OSError, IOException) as e:
+                IJ.log("Error creating directory {}: {}".format(path, e))
 
     def _discover_paths(self):
         """ Creates dict of essential project components """
@@ -132,96 +445,161 @@ class Project(object):
             'results_db': os.path.join(self.root_dir, 'Results_DB.csv')
         }
 
-    def _load_project_db(self):
+    def _build_index(self):
         """
-        Loads and parses both databases and immediately tries to populate
-        ROI details from zip files if they are missing from the DB.
+        Builds the project's image list in one pass: lists the Images folder once, loads both
+        databases, adds untracked images and sorts once at the end. ROI details missing from the
+        DB are read from the zip files later, when an image's ROIs are first needed.
         """
-        images_map = {}
+        # One listing of the ROI folder answers has_roi() for every image without a stat each
+        self._roi_files = set(_list_dir_names(self.paths['rois']))
+        self._load_project_db()
+        self._scan_for_new_images(_list_dir_names(self.paths['images']))
+
+        # The DBs are saved in sorted order, so usually only newly found images need sorting in
+        sort_keys = [img._sort_key for img in self.images]
+        if any(a > b for a, b in zip(sort_keys, sort_keys[1:])):
+            self.images.sort(key=attrgetter('_sort_key'))
+
+    def _load_project_db(self):
+        """ Loads and parses both databases into ProjectImage objects, keeping the order of the DB files """
+        images_map = OrderedDict()
+        images_dir = self.paths['images']
+        rois_dir = self.paths['rois']
+        roi_files = self._roi_files
+
+        # Status and bregma values repeat across thousands of rows; keep one string object per distinct value.
+        # (intern() can't be used, it rejects the unicode strings the java reader returns.)
+        string_pool = dict((value, value) for value in (_NA, _FROM_FILE, _NEW, _UNTRACKED, _DEFINED, _MODIFIED))
+        share = string_pool.setdefault
 
         # Load Image Status DB
         status_db_path = self.paths['image_status_db']
-        if os.path.exists(status_db_path):
-            with open(status_db_path, 'r') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    filename = row['filename']
-                    if filename not in images_map:
-                        images_map[filename] = ProjectImage(filename, self.root_dir)
-                    images_map[filename].status = row.get('status', 'New')
+        if _csv_has_rows(status_db_path, _STATUS_DB_HEADERS):
+            with closing(_read_csv_rows(status_db_path)) as rows:
+                for row in rows:
+                    filename = row[0]
+                    image = images_map.get(filename)
+                    if image is None:
+                        image = images_map[filename] = ProjectImage(filename, images_dir, rois_dir, roi_files)
+                    image.status = share(row[1], row[1]) if len(row) > 1 else _NEW
 
         # Load ROI DB
         roi_db_path = self.paths['roi_db']
-        if os.path.exists(roi_db_path):
-            with open(roi_db_path, 'r') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    filename = row['filename']
-                    if filename not in images_map:
-                        images_map[filename] = ProjectImage(filename, self.root_dir)
-                    images_map[filename].add_roi(row)
-
-        # Loop through all loaded images and populate from zip if needed 
-        for image in images_map.values():
-            image.populate_rois_from_zip()
-
-        self.images = sorted(images_map.values(), key=lambda img: img.filename)
-
-    def _scan_for_new_images(self):
-        """ Scans images folder for any files not already loaded from the DBs. """
-        if not os.path.isdir(self.paths['images']):
+        if _csv_has_rows(roi_db_path, _ROI_DB_HEADERS):
+            with closing(_read_csv_rows(roi_db_path)) as rows:
+                for row in rows:
+                    if len(row) < 4:
+                        continue # skip malformed lines
+                    filename, roi_name, bregma, status = row[:4]
+                    image = images_map.get(filename)
+                    if image is None:
+                        image = images_map[filename] = ProjectImage(filename, images_dir, rois_dir, roi_files)
+                    image.add_roi(RoiRecord(roi_name, share(bregma, bregma), share(status, status)))
+
+        self._by_filename = images_map
+        self.images = list(images_map.values())
+
+    def _scan_for_new_images(self, image_files):
+        """ Adds any files from the Images folder listing not already loaded from the DBs. """
+        existing_filenames = self._by_filename
+        images_dir = self.paths['images']
+        rois_dir = self.paths['rois']
+        roi_files = self._roi_files
+        splitext = os.path.splitext
+        for f in image_files:
+            if splitext(f)[1].lower() in _IMAGE_EXTS and f not in existing_filenames:
+                new_image = ProjectImage(f, images_dir, rois_dir, roi_files)
+                new_image.status = _UNTRACKED
+                self.add_image(new_image)
+
+    def populate_missing_rois(self, images, max_threads=8):
+        """
+        Reads the ROI zips of any of the given images whose ROIs aren't loaded yet. The zips are
+        read on a thread pool, each thread with its own hidden RoiManager, and all are done on return.
+        """
+        pending = [img for img in images if not img.rois_loaded and img.has_roi()]
+        if len(pending) < 2:
+            for img in pending:
+                img.populate_rois_from_zip()
             return
-        
-        existing_filenames = {img.filename for img in self.images}
-        for f in sorted(os.listdir(self.paths['images'])):
-            if f.lower().endswith(('.tif', '.tiff', 'jpg', 'jpeg')) and f not in existing_filenames:
-                new_image = ProjectImage(f, self.root_dir)
-                new_image.status = "Untracked"
-                new_image.populate_rois_from_zip() # new images
-                self.images.append(new_image)
+
+        pool = Executors.newFixedThreadPool(min(max_threads, len(pending)))
+        try:
+            # Submit every read first, then wait on them in order
+            futures = [pool.submit(_RoiZipTask(img)) for img in pending]
+            for future in futures:
+                future.get()
+        finally:
+            pool.shutdown()
+
+    def add_image(self, image):
+        """ Adds a ProjectImage to the project, keeping the filename index in step with the image list """
+        self.images.append(image)
+        self._by_filename[image.filename] = image
+        self._dirty = True
+
+    def mark_dirty(self):
+        """ Flags in-memory changes (ROI or status edits) so the next sync writes the databases """
+        self._dirty = True
 
     def sync_project_db(self):
-        """ Master save function that syncs both databases. """
+        """ Master save function that syncs both databases. Skips the rewrite if nothing has changed. """
+        if not self._dirty:
+            IJ.log("Sync: no changes to save.")
+            return True
+
         roi_success = self._sync_roi_db()
         status_success = self._sync_image_status_db()
-        return roi_success and status_success
+        if roi_success and status_success:
+            self._dirty = False
+            return True
+        return False
 
     def _sync_roi_db(self):
-        """ Rewrites the Roi_DB.csv (ROI data) from memory. """
+        """ Rewrites the Roi_DB.csv (ROI data) from memory, via a temp file so a failed write can't truncate it. """
         db_path = self.paths['roi_db']
-        headers = ['filename', 'roi_name', 'bregma', 'status']
+        tmp_path = db_path + '.tmp'
+        headers = _ROI_DB_HEADERS
         try:
-            with open(db_path, 'wb') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=headers)
-                writer.writeheader()
-                for image in self.images:
-                    if not image.rois:
-                        continue # Skip images with no ROIs
-                    for roi_data in image.rois:
-                        row = {
-                            'filename': image.filename,
-                            'roi_name': roi_data.get('roi_name', 'N/A'),
-                            'bregma': roi_data.get('bregma', 'N/A'),
-                            'status': roi_data.get('status', 'Pending')
-                        }
-                        writer.writerow(row)
+            # Fields are plain strings, so format the lines directly rather than going through the csv module
+            with open(tmp_path, 'wb', CSV_BUFSIZE) as csvfile:
+                csvfile.write(_csv_line(headers))
+                csvfile.writelines(_csv_line(row) for row in self._iter_roi_rows())
+                _sync_to_disk(csvfile)
+            _replace_file(tmp_path, db_path)
             return True
-        except IOError as e:
+        except (Exception, IOException) as e:
+            # Anything at all, so a failed write never leaves the temp file behind
+            _discard_tmp_file(tmp_path)
             IJ.log("Error syncing ROI DB: {}".format(e))
             return False
 
+    def _iter_roi_rows(self):
+        """ Yields one Roi_DB.csv row per ROI, skipping images with no ROIs """
+        for image in self.images:
+            if not image.rois:
+                continue
+            filename = image.filename
+            for roi_data in image.rois:
+                yield (filename, roi_data.roi_name, roi_data.bregma, roi_data.status)
+
     def _sync_image_status_db(self):
-        """ Rewrites the Image_Status_DB.csv from memory. """
+        """ Rewrites the Image_Status_DB.csv from memory, via a temp file so a failed write can't truncate it. """
         db_path = self.paths['image_status_db']
-        headers = ['filename', 'status']
+        tmp_path = db_path + '.tmp'
+        headers = _STATUS_DB_HEADERS
         try:
-            with open(db_path, 'wb') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=headers)
-                writer.writeheader()
-                for image in self.images:
-                    writer.writerow({'filename': image.filename, 'status': image.status})
+            # Formatted directly like the ROI DB, no csv module on the write path
+            with open(tmp_path, 'wb', CSV_BUFSIZE) as csvfile:
+                csvfile.write(_csv_line(headers))
+                csvfile.writelines(_csv_line((image.filename, image.status)) for image in self.images)
+                _sync_to_disk(csvfile)
+            _replace_file(tmp_path, db_path)
             return True
-        except IOError as e:
+        except (Exception, IOException) as e:
+            # Anything at all, so a failed write never leaves the temp file behind
+            _discard_tmp_file(tmp_path)
             IJ.log("Error syncing Image Status DB: {}".format(e))
             return False
 
@@ -229,12 +607,55 @@ class Project(object):
 # Main GUI Classes
 #==============================================
 
+class _LazyDirNode(DefaultMutableTreeNode):
+    """ File tree node for a folder, its contents are only listed the first time it's expanded """
+    def __init__(self, name, path):
+        super(_LazyDirNode, self).__init__(name)
+        self.path = path
+        self.loaded = False
+        self.add(DefaultMutableTreeNode("Loading...")) # placeholder so the folder shows as expandable
+
+class _LazyTreeLoader(TreeWillExpandListener):
+    """ Fills in a folder node's children just before the tree expands it """
+    def __init__(self, tree_model):
+        self.tree_model = tree_model
+
+    def treeWillExpand(self, event):
+        node = event.getPath().getLastPathComponent()
+        if not isinstance(node, _LazyDirNode) or node.loaded:
+            return
+        node.loaded = True
+        node.removeAllChildren()
+        for name in sorted(_list_dir_names(node.path)):
+            child_path = os.path.join(node.path, name)
+            if os.path.isdir(child_path):
+                node.add(_LazyDirNode(name, child_path))
+            else:
+                node.add(DefaultMutableTreeNode(name))
+        self.tree_model.nodeStructureChanged(node)
+
+    def treeWillCollapse(self, event):
+        pass
+
 class ProjectManagerGUI(WindowAdapter):
     """ Builds and manages the main GUI, facilitating dialogs and and controling the script """
     def __init__(self):
         self.project = None
+        self._image_to_row = {} # ProjectImage -> image table row
+        self._row_to_image = [] # image table row -> ProjectImage, as shown in the table
         self.unsaved_changes = False
         self.save_proj_item = None
+
+        # Coalesces bursts of selection events (select all, range drags) into one update
+        self._selection_timer = Timer(50, self._apply_selection)
+        self._selection_timer.setRepeats(False)
+        self._last_selection = None
+        self._ignore_selection = False # set while the image table is being repopulated
+        self._opening_image = None # ImageOpenWorker still loading an image for the ROI editor
+
+        # One ROI details model for the whole session, pointed at whichever image is selected
+        self._roi_model = EditableROIsTableModel(None)
+        self._roi_model.addTableModelListener(self._on_roi_table_changed)
         
         self.frame = JFrame("Project Manager")
         self.frame.setSize(900, 700)
@@ -267,31 +688,38 @@ class ProjectManagerGUI(WindowAdapter):
     def build_main_panel(self):
         # Project header
         self.project_name_label = JLabel("No Project Loaded")
-        self.project_name_label.setFont(Font("SansSerif", Font.BOLD, 16))
-        self.project_name_label.setBorder(EmptyBorder(10,10,10,10))
+        self.project_name_label.setFont(_HEADER_FONT)
+        self.project_name_label.setBorder(_PAD10)
         self.frame.add(self.project_name_label, BorderLayout.NORTH)
 
         # File Tree
         root_node = DefaultMutableTreeNode("Project")
         self.tree_model = DefaultTreeModel(root_node)
         self.file_tree = JTree(self.tree_model)
+        self.file_tree.addTreeWillExpandListener(_LazyTreeLoader(self.tree_model))
         tree_scroll_pane = JScrollPane(self.file_tree)
 
         right_panel = JPanel(BorderLayout())
 
         # Image table 
-        image_cols = ["Filename", "ROI File", "# ROIs", "Status"]
-        self.image_table_model = DefaultTableModel(None, image_cols)
+        self.image_table_model = ImageTableModel()
         self.image_table = JTable(self.image_table_model)
+        # Columns never change, so keep them (and their widths) across data refreshes
+        self.image_table.setAutoCreateColumnsFromModel(False)
+        column_model = self.image_table.getColumnModel()
+        for i, width in enumerate([260, 60, 60, 100]):
+            column_model.getColumn(i).setPreferredWidth(width)
         self.image_table.setSelectionMode(ListSelectionModel.MULTIPLE_INTERVAL_SELECTION)
         self.image_table.getSelectionModel().addListSelectionListener(self.on_image_selection)
         image_table_pane = JScrollPane(self.image_table)
-        image_table_pane.setBorder(BorderFactory.createTitledBorder("Project Images"))
+        image_table_pane.setBorder(_TB_IMAGES)
         
         # ROI detail table
-        self.roi_table = JTable()
+        # The ROI model is only ever re-pointed, never replaced, so its columns are created once
+        self.roi_table = JTable(self._roi_model)
+        self.roi_table.setAutoCreateColumnsFromModel(False)
         roi_table_pane = JScrollPane(self.roi_table)
-        roi_table_pane.setBorder(BorderFactory.createTitledBorder("ROI Details (Editable)"))
+        roi_table_pane.setBorder(_TB_ROI_DETAILS)
         
         # Split pane for two tables
         right_split_pane = JSplitPane(JSplitPane.VERTICAL_SPLIT, image_table_pane, roi_table_pane)
@@ -305,7 +733,7 @@ class ProjectManagerGUI(WindowAdapter):
 
     def build_status_bar(self):
         control_panel = JPanel(BorderLayout())
-        control_panel.setBorder(EmptyBorder(5,5,5,5))
+        control_panel.setBorder(_PAD5)
 
         self.status_label = JLabel("Open a project folder to begin")
         control_panel.add(self.status_label, BorderLayout.CENTER)
@@ -332,6 +760,10 @@ class ProjectManagerGUI(WindowAdapter):
 
     def set_unsaved_changes(self, state):
         """ Updates UI to show if there are unsaved changes """
+        if state and self.project:
+            self.project.mark_dirty()
+        if state == self.unsaved_changes and self.save_proj_item.isEnabled() == state:
+            return # already showing this state, skip the title/menu updates
         self.unsaved_changes = state
         self.save_proj_item.setEnabled(state)
         title = "Project Manager"
@@ -364,34 +796,58 @@ class ProjectManagerGUI(WindowAdapter):
             return False
 
     def on_image_selection(self, event):
-        """ called when user selects image(s) in the top table"""
+        """ called when user selects image(s) in the top table, restarts the timer so only the last event is handled """
+        if self._ignore_selection:
+            return
         if not event.getValueIsAdjusting():
-            # get count of selected images
-            selection_count = self.image_table.getSelectedRowCount()
+            self._selection_timer.restart()
 
-            # enable define/edit ROIs only if exactly one image selected
-            self.roi_button.setEnabled(selection_count == 1)
+    def _apply_selection(self, event):
+        """ Updates buttons, status and ROI table once the image selection has settled """
+        selected_rows = tuple(self.image_table.getSelectedRows())
+        if selected_rows == self._last_selection:
+            return # nothing changed, keep the current ROI table model
+        self._last_selection = selected_rows
 
-            # enable run quantification if one or more images selected
-            self.quant_button.setEnabled(selection_count > 0)
+        # get count of selected images
+        selection_count = len(selected_rows)
 
-            if selection_count == 1:
-                selected_row = self.image_table.getSelectedRow()
-                selected_image = self.project.images[selected_row]
-                self.status_label.setText("Selected: {}".format(selected_image.filename))
+        # enable define/edit ROIs only if exactly one image selected
+        self.roi_button.setEnabled(selection_count == 1 and self._opening_image is None)
 
-                # Populate the ROI details table
-                editable_model = EditableROIsTableModel(selected_image)
-                editable_model.addTableModelListener(lambda e: self.set_unsaved_changes(True))
-                self.roi_table.setModel(editable_model)
+        # enable run quantification if one or more images selected
+        self.quant_button.setEnabled(selection_count > 0)
 
-            elif selection_count > 1:
-                self.status_label.setText("Selected: {} images".format(selection_count))
-                self.roi_table.setModel(EditableROIsTableModel(None)) # clear bottom table
+        if selection_count == 1:
+            selected_row = self.image_table.convertRowIndexToModel(selected_rows[0])
+            selected_image = self._row_to_image[selected_row]
+            self.status_label.setText("Selected: {}".format(selected_image.filename))
 
-            else:
-                self.status_label.setText("No Image(s) Selected")
-                self.roi_table.setModel(EditableROIsTableModel(None)) # clear table
+            # First look at this image, read its ROI zip now
+            if not selected_image.rois_loaded:
+                selected_image.populate_rois_from_zip()
+                self.image_table_model.fireTableRowsUpdated(selected_row, selected_row)
+
+            # Populate the ROI details table
+            self._roi_model.set_image(selected_image)
+
+        elif selection_count > 1:
+            self.status_label.setText("Selected: {} images".format(selection_count))
+            self._clear_roi_table() # clear bottom table
+
+        else:
+            self.status_label.setText("No Image(s) Selected")
+            self._clear_roi_table() # clear table
+
+    def _clear_roi_table(self):
+        """ Empties the ROI details table, skipping the event if it's already empty """
+        if self._roi_model.image is not None:
+            self._roi_model.set_image(None)
+
+    def _on_roi_table_changed(self, event):
+        """ Flags unsaved changes for edits, not for the model being pointed at another image """
+        if not self._roi_model.switching_image:
+            self.set_unsaved_changes(True)
 
     def toggle_select_all_action(self, event):
         """ Selects all rows in the image table if not all are selected or clears selection if all are already selected"""
@@ -401,33 +857,44 @@ class ProjectManagerGUI(WindowAdapter):
         
         selected_count = self.image_table.getSelectedRowCount()
 
-        if selected_count == row_count:
-            self.image_table.clearSelection()
-        else:
-            self.image_table.selectAll()
+        # Mark the change as adjusting so listeners only act on the single final event
+        selection_model = self.image_table.getSelectionModel()
+        selection_model.setValueIsAdjusting(True)
+        try:
+            if selected_count == row_count:
+                selection_model.clearSelection()
+            else:
+                selection_model.setSelectionInterval(0, row_count - 1)
+        finally:
+            selection_model.setValueIsAdjusting(False)
 
     def open_roi_editor_action(self, event):
         """ Opens ROI editor window for selected image """
         selected_row = self.image_table.getSelectedRow()
-        if selected_row != -1:
-            selected_image = self.project.images[selected_row]
+        if selected_row != -1 and self._opening_image is None:
+            selected_image = self._image_at_view_row(selected_row)
 
-            editor = ROIEditor(self, self.project, selected_image)
-            editor.show()
+            # Open the image off the EDT, the editor is built once it's loaded. Only one open at
+            # a time, so a second click can't put two editors on the same image.
+            self.roi_button.setEnabled(False)
+            self.status_label.setText("Opening {}...".format(selected_image.filename))
+            self.frame.setCursor(Cursor.getPredefinedCursor(Cursor.WAIT_CURSOR))
+            self._opening_image = ImageOpenWorker(self, selected_image)
+            self._opening_image.execute()
 
     def open_quantification_dialog_action(self, event):
         """ Gathers selected images and opens the quantification settings dialog. """
         selected_rows = self.image_table.getSelectedRows()
         if not selected_rows: return
 
-        selected_images = [self.project.images[row] for row in selected_rows]
+        selected_images = [self._image_at_view_row(row) for row in selected_rows]
 
         quant_dialog = QuantificationDialog(self.frame, selected_images)
         settings = quant_dialog.show_dialog()
 
         if settings:
             progress_dialog = ProgressDialog(self.frame, "Processing images...", 100)
-            worker = QuantificationWorker(self.project, settings, progress_dialog)
+            worker = QuantificationWorker(self.project, settings, progress_dialog, self)
             progress_dialog.setVisible(True)
             worker.execute()
 
@@ -442,38 +909,14 @@ class ProjectManagerGUI(WindowAdapter):
         chooser.setFileFilter(FileNameExtensionFilter("Image Files (tif, tiff, jpg, jpeg)", ["tif","tiff","jpg","jpeg"]))
 
         if chooser.showOpenDialog(self.frame) == JFileChooser.APPROVE_OPTION:
-            selected_files = chooser.getSelectedFiles()
-            images_dir = self.project.paths['images']
-            newly_added_count = 0
-
-            for source_file in selected_files:
-                source_path = source_file.toPath()
-                dest_file = File(images_dir, source_file.getName())
-                dest_path = dest_file.toPath()
+            selected_files = list(chooser.getSelectedFiles())
 
-                # Check if file with name already exists
-                if dest_file.exists():
-                    IJ.error("Skipped Import", "{} already exists in the project").format(source_file.getName())
-                    continue
-
-                try:
-                    Files.copy(source_path, dest_path, StandardCopyOption.REPLACE_EXISTING)
-
-                    # Create projectImage object and add it to memory
-                    new_image = ProjectImage(dest_file.getName(), self.project.root_dir)
-                    new_image.status = "Untracked"
-                    self.project.images.append(new_image)
-                    newly_added_count += 1
-
-                except Exception as e:
-                    error_msg ="Failed to import '{}': {}".format(source_file.getName(), e) 
-                    IJ.log(error_msg)
-                    JOptionPane.showMessageDialog(self.frame, error_msg, "Import Error", JOptionPane.ERROR_MESSAGE)
-
-            if newly_added_count > 0:
-                self.status_label.setText("Successfully imported {} new images.".format(newly_added_count))
-                self.update_ui_for_project()
-                self.set_unsaved_changes(True)     
+            # Copy on a background thread so the window stays responsive for large imports
+            self.import_button.setEnabled(False)
+            progress_dialog = ProgressDialog(self.frame, "Importing images...", len(selected_files))
+            worker = ImportWorker(self, selected_files, progress_dialog)
+            progress_dialog.setVisible(True)
+            worker.execute()
 
 
     def windowClosing(self, event):
@@ -524,52 +967,77 @@ class ProjectManagerGUI(WindowAdapter):
         # Update name
         self.project_name_label.setText("Project: " + self.project.name)
         
-        # Image table
-        while self.image_table_model.getRowCount() > 0:
-            self.image_table_model.removeRow(0)
-        
-        for img in self.project.images:
-            roi_file_status = "Yes" if img.has_roi() else "No"
-            self.image_table_model.addRow([
-                img.filename,
-                roi_file_status,
-                len(img.rois),
-                img.status
-            ])
-
-        # update file tree 
-        root_node = DefaultMutableTreeNode(self.project.name)
-        for name, path in self.project.paths.items():
-            # show directorys and key files
-            if os.path.isdir(path) or name.endswith('_db'):
-                node = DefaultMutableTreeNode(os.path.basename(path))
-                root_node.add(node)
-
-        self.tree_model.setRoot(root_node)
-
-    def refresh_project_and_ui(self):
+        # Image table, the model reads cells straight from the images and refreshes with one event
+        self._row_to_image = list(self.project.images)
+        self._image_to_row = dict((img, row) for row, img in enumerate(self._row_to_image))
+        # Replacing the data clears the selection. The listener ignores that event and the
+        # cleared selection is applied once below. (A Jython-wrapped listener can't be removed
+        # and re-added reliably, so it is muted with a flag instead.)
+        self._ignore_selection = True
+        try:
+            self.image_table_model.set_images(self._row_to_image)
+        finally:
+            self._ignore_selection = False
+        self._last_selection = None # rows now hold new data, so the selection must be applied
+        self._apply_selection(None)
+
+        # update file tree, reusing the root for the same project so the tree keeps its UI state
+        root_node = self.tree_model.getRoot()
+        same_root = root_node.getUserObject() == self.project.name
+        if same_root:
+            root_node.removeAllChildren()
+        else:
+            root_node = DefaultMutableTreeNode(self.project.name)
+        for name, path, is_dir in self.project.tree_entries:
+            root_node.add(_LazyDirNode(name, path) if is_dir else DefaultMutableTreeNode(name))
+
+        if same_root:
+            self.tree_model.nodeStructureChanged(root_node)
+        else:
+            self.tree_model.setRoot(root_node)
+
+    def _image_at_view_row(self, view_row):
+        """ Returns the image shown at a table row, converting through any row sorter to the model row """
+        return self._row_to_image[self.image_table.convertRowIndexToModel(view_row)]
+
+    def append_image_row(self, img):
+        """ Adds one image to the end of the image table without touching the other rows """
+        self.image_table_model.add_image(img) # appends to the row list shared with self._row_to_image
+        self._image_to_row[img] = self.image_table_model.getRowCount() - 1
+
+    def refresh_image_row(self, img):
+        """ Repaints the image table row for a single image """
+        row = self._image_to_row.get(img)
+        if row is None:
+            return
+        self.image_table_model.fireTableRowsUpdated(row, row)
+
+    def refresh_project_and_ui(self, img):
         """
-        Reloads the project from disk and updates the UI tables.
+        Updates the UI for one image whose ROIs or status changed, without reloading the project from disk.
         This method will be called by the ROIEditor when it closes.
         """
         if self.project:
-            self.load_project(self.project.root_dir)
+            self.refresh_image_row(img)
+            # The image's ROI list may have been replaced, so rebuild the ROI details table
+            self._last_selection = None
+            self._apply_selection(None)
 
 class ROIEditor(WindowAdapter):
     """ Creates Jframe with all tools for creating, modifing and managing ROIs for a single image """
-    def __init__(self, parent_gui, project, project_image):
+    def __init__(self, parent_gui, project, project_image, imp=None):
         self.parent_gui = parent_gui
         self.project = project
         self.image_obj = project_image
         self.win = None
+        self.frame = None
 
-        # Open Image and create canvas and imagewindow to hold it
-        self.imp = IJ.openImage(self.image_obj.full_path)
+        # Open Image (unless already opened by ImageOpenWorker). The imagewindow to hold it is only
+        # created in show(), once the editor is built, by _ensure_window
+        self.imp = imp if imp is not None else IJ.openImage(self.image_obj.full_path)
         if not self.imp:
             IJ.error("Failed to open image:", self.image_obj.full_path)
             return
-        self.imp.show()
-        self.win = self.imp.getWindow()
 
         # Open rm
         self.rm = RoiManager(True) 
@@ -579,25 +1047,27 @@ class ROIEditor(WindowAdapter):
             self.rm.runCommand("Open", self.image_obj.roi_path)
 
         # Build GUI
-        self.frame = JDialog(self.win, "ROI Editor Controls: " + self.image_obj.filename, False)
+        self.frame = JDialog(self.parent_gui.frame, "ROI Editor Controls: " + self.image_obj.filename, False)
         self.frame.setSize(350,700)
         self.frame.addWindowListener(self)
         self.frame.setLayout(BorderLayout(5,5))
 
         # ROI list
-        self.roi_list_model = DefaultListModel()
+        self.roi_list = None
         self.update_roi_list_from_manager()
         self.roi_list = JList(self.roi_list_model)
         self.roi_list.setSelectionMode(ListSelectionModel.SINGLE_SELECTION)
+        # fixed row height so the list doesn't measure every cell on layout
+        self.roi_list.setFixedCellHeight(self.roi_list.getFontMetrics(self.roi_list.getFont()).getHeight() + 2)
         # listener to update text fields when roi is selected
         self.roi_list.addListSelectionListener(self._on_roi_select)
 
         list_pane = JScrollPane(self.roi_list)
-        list_pane.setBorder(BorderFactory.createTitledBorder("ROIs"))
+        list_pane.setBorder(_TB_ROIS)
 
         # Edit Panel
         edit_panel = JPanel(GridLayout(0,2,5,5))
-        edit_panel.setBorder(BorderFactory.createTitledBorder("Edit Selected ROI"))
+        edit_panel.setBorder(_TB_EDIT)
         self.roi_name_field = JTextField()
         self.bregma_field = JTextField()
         edit_panel.add(JLabel("ROI Name: "))
@@ -612,7 +1082,7 @@ class ROIEditor(WindowAdapter):
 
         # Button panel
         button_panel = JPanel(GridLayout(0, 1, 10, 10))
-        button_panel.setBorder(BorderFactory.createEmptyBorder(10,10,10,10))
+        button_panel.setBorder(_PAD10)
 
         create_button = JButton("Create New From Selection", actionPerformed=self._create_new_roi)
         update_button = JButton("Update Selected ROI", actionPerformed=self._update_selected_roi)
@@ -636,8 +1106,11 @@ class ROIEditor(WindowAdapter):
         self.frame.add(south_contols, BorderLayout.SOUTH)
 
     def show(self):
-        if not self.frame or not self.win:
+        if not self.frame:
             return # dont show if init failed
+        self._ensure_window()
+        if not self.win:
+            return
         
         img_win_x = self.win.getX()
         img_win_width = self.win.getWidth()
@@ -647,21 +1120,38 @@ class ROIEditor(WindowAdapter):
         self.frame.setLocation(img_win_x + img_win_width, img_win_y)
         self.frame.setVisible(True)
 
+    def _ensure_window(self):
+        """ Shows the image in its window the first time it's needed """
+        if self.win is None:
+            self.imp.show()
+            self.win = self.imp.getWindow()
+
     def update_roi_list_from_manager(self):
-        """ Syncs JList with IJ roi manager"""
-        self.roi_list_model.clear()
-        rois = self.rm.getRoisAsArray()
-        for roi in rois:
-            self.roi_list_model.addElement(roi.getName())
+        """
+        Syncs JList and the name set with IJ roi manager. The names are read by index, without copying
+        the ROI array, into a new model that has no listeners yet, then swapped in with one event.
+        """
+        rm = self.rm
+        model = DefaultListModel()
+        roi_names = set()
+        for i in range(rm.getCount()):
+            name = rm.getName(i)
+            model.addElement(name)
+            roi_names.add(name)
+        self._roi_names = roi_names
+        self.roi_list_model = model
+        if self.roi_list is not None:
+            self.roi_list.setModel(model)
 
     def _toggle_show_all(self, event):
         """ toggles visibility of all ROIs in image """
         checkbox = event.getSource()
 
+        # pass the editor's image so the command doesn't have to look up the current image
         if checkbox.isSelected():
-            self.rm.runCommand("Show All")
+            self.rm.runCommand(self.imp, "Show All")
         else:
-            self.rm.runCommand("Show None")
+            self.rm.runCommand(self.imp, "Show None")
 
     def _on_roi_select(self, event):
         """ when roi is selected in list, update text fields"""
@@ -673,11 +1163,8 @@ class ROIEditor(WindowAdapter):
                 self.roi_name_field.setText(selected_name)
 
                 # Find Roi data in project data
-                bregma_val = 'N/A'
-                for roi_data in self.image_obj.rois:
-                    if roi_data.get('roi_name') == selected_name:
-                        bregma_val = roi_data.get('bregma', 'N/A')
-                        break
+                roi_data = self.image_obj.get_roi(selected_name)
+                bregma_val = roi_data.bregma if roi_data else 'N/A'
                 self.bregma_field.setText(bregma_val)
 
     def _create_new_roi(self, event):
@@ -701,24 +1188,17 @@ class ROIEditor(WindowAdapter):
         current_roi.setName(new_name)
         self.rm.addRoi(current_roi)
 
-        self.image_obj.add_roi({
-            'roi_name': new_name,
-            'bregma': new_bregma,
-            'status': 'Defined'
-        })
+        self.image_obj.add_roi(RoiRecord(new_name, new_bregma, _DEFINED))
 
         self.roi_list_model.addElement(new_name)
+        self._roi_names.add(new_name)
         self.roi_list.setSelectedValue(new_name, True)
 
     def _is_name_unique(self, name_to_check, ignore_index=-1):
-        """ Checks a given game is not in the ROI manager already """
-        rois = self.rm.getRoisAsArray()
-        for i, roi in enumerate(rois):
-            if i == ignore_index:
-                continue
-            if roi.getName() == name_to_check:
-                return False
-        return True    
+        """ Checks a given game is not in the ROI manager already, using the name set kept alongside the list """
+        if ignore_index != -1 and self.roi_list_model.get(ignore_index) == name_to_check:
+            return True
+        return name_to_check not in self._roi_names
 
     def _update_selected_roi(self,event):
         selected_index = self.roi_list.getSelectedIndex()
@@ -732,30 +1212,25 @@ class ROIEditor(WindowAdapter):
         original_index = self.roi_list.getSelectedIndex()
 
         # Update ROI name in the ROI Manager
-        self.rm.runCommand("Rename", new_name)
+        self.rm.rename(selected_index, new_name)
         
         # Update data in our project structure
         # Find the original name to locate the data entry
         original_name = self.roi_list.getSelectedValue()
-        found = False
-        for roi_data in self.image_obj.rois:
-            if roi_data.get('roi_name') == original_name:
-                roi_data['roi_name'] = new_name
-                roi_data['bregma'] = new_bregma
-                roi_data['status'] = 'Modified'
-                found = True
-                break
-        
+        roi_data = self.image_obj.get_roi(original_name)
+        if roi_data:
+            self.image_obj.rename_roi(roi_data, new_name)
+            roi_data.bregma = new_bregma
+            roi_data.status = _MODIFIED
+
         # If it was a newly created ROI, it won't be in the list yet
-        if not found:
-            self.image_obj.add_roi({
-                'roi_name': new_name,
-                'bregma': new_bregma,
-                'status': 'Defined'
-            })
+        else:
+            self.image_obj.add_roi(RoiRecord(new_name, new_bregma, _DEFINED))
             
         if original_index != -1:
             self.roi_list_model.setElementAt(new_name, original_index)
+            self._roi_names.discard(original_name)
+            self._roi_names.add(new_name)
 
     def _delete_selected_roi(self, event):
         selected_index = self.roi_list.getSelectedIndex()
@@ -770,11 +1245,12 @@ class ROIEditor(WindowAdapter):
         self.rm.select(selected_index)
         self.rm.runCommand("Delete")
 
-        # delete dictionary from data list
-        self.image_obj.rois = [roi for roi in self.image_obj.rois if roi.get('roi_name') != roi_name_to_delete]
+        # delete record from data list
+        self.image_obj.remove_roi(roi_name_to_delete)
 
         if selected_index != -1:
             self.roi_list_model.removeElementAt(selected_index)
+            self._roi_names.discard(roi_name_to_delete)
 
         # refresh visible list from update manager & clear text field
         self.roi_name_field.setText("")
@@ -790,7 +1266,7 @@ class ROIEditor(WindowAdapter):
             IJ.error("Save Failed", "Could not save the image status database. See Log.")
             return
 
-        self.parent_gui.refresh_project_and_ui()
+        self.parent_gui.refresh_project_and_ui(self.image_obj)
         self.cleanup()
 
 
@@ -802,11 +1278,6 @@ class ROIEditor(WindowAdapter):
         # Get the final list of ROIs from the manager, which is the source of truth for shapes and names.
         rois_from_manager = self.rm.getRoisAsArray()
 
-        # Create a lookup map of existing ROI data (name -> full data dict) from internal project data to preserve metadata like bregma.
-        existing_roi_data_map = {
-            roi_info['roi_name']: roi_info for roi_info in self.image_obj.rois
-        }
-
         # This will be the new, synchronized list of ROI data for the image object.
         new_rois_list = []
 
@@ -814,55 +1285,124 @@ class ROIEditor(WindowAdapter):
         for roi in rois_from_manager:
             roi_name = roi.getName()
             
-            # Check if we have existing metadata for this ROI.
-            if roi_name in existing_roi_data_map:
-                # Yes, so we carry over its existing data dictionary, preserving its bregma and status.
-                new_rois_list.append(existing_roi_data_map[roi_name])
+            # Check if we have existing metadata for this ROI, using the image's name index.
+            roi_data = self.image_obj.get_roi(roi_name)
+            if roi_data:
+                # Yes, so we carry over its existing record, preserving its bregma and status.
+                new_rois_list.append(roi_data)
             else:
                 # No, this is a brand new ROI created in this session. We add it to our list with default values.
-                new_rois_list.append({
-                    'roi_name': roi_name,
-                    'bregma': '0.00',  # Default Bregma for new ROIs
-                    'status': 'Defined'
-                })
+                new_rois_list.append(RoiRecord(roi_name, '0.00', _DEFINED))  # Default Bregma for new ROIs
 
         # Replace the image object's old ROI list with the newly synchronized one.
-        self.image_obj.rois = new_rois_list
+        self.image_obj.set_rois(new_rois_list)
 
         # Now, perform the final save operations with the fully consistent data.
-        self.rm.runCommand("Save", self.image_obj.roi_path)
+        self.rm.save(self.image_obj.roi_path)
+        self.image_obj.refresh_has_roi()
         self.project._sync_roi_db()
 
-        self.parent_gui.refresh_project_and_ui()
+        self.parent_gui.refresh_project_and_ui(self.image_obj)
         self.cleanup()
 
     def cleanup(self):
         """ Closes image and disposes frame """
         if self.imp:
-            self.imp.close()
-        self.frame.dispose()
+            self.imp.close() # also fine if the window was never shown
+        if self.frame:
+            self.frame.dispose()
 
     def windowClosing(self, event):
         """ called when x on window is clicked """
         self.cleanup()
 
+class ImageTableModel(AbstractTableModel):
+    """ Read-only table model for the project image table, cells are read straight from the ProjectImage objects """
+    def __init__(self):
+        self.headers = ["Filename", "ROI File", "# ROIs", "Status"]
+        self.images = [] # row -> ProjectImage
+
+    def set_images(self, images):
+        """ Shows a new list of images, with one data-changed event """
+        self.images = images
+        self.fireTableDataChanged()
+
+    def add_image(self, image):
+        """ Appends one image as a new last row """
+        self.images.append(image)
+        row = len(self.images) - 1
+        self.fireTableRowsInserted(row, row)
+
+    def getRowCount(self):
+        return len(self.images)
+
+    def getColumnCount(self):
+        return len(self.headers)
+
+    def getColumnName(self, columnIndex):
+        return self.headers[columnIndex]
+
+    def getValueAt(self, rowIndex, columnIndex):
+        img = self.images[rowIndex]
+        if columnIndex == 0:
+            return img.filename
+        if columnIndex == 1:
+            return "Yes" if img.has_roi() else "No"
+        if columnIndex == 2:
+            # ROI zips are read lazily, so the count is unknown until the image is first selected
+            if img.rois_loaded or not img.has_roi():
+                return len(img.rois)
+            return "?"
+        return img.status
+
 class EditableROIsTableModel(AbstractTableModel):
     """ Helper class to creat custom table model that allows editing of ROI details table"""
     def __init__(self, project_image):
         self.image = project_image
         self.headers = ["ROI Name", "Bregma", "Status"]
+        self._keys = ['roi_name', 'bregma', 'status'] # RoiRecord attribute for each column
         self.data = self.image.rois if self.image else []
-        self.header_map = {'roi_name': 0, 'bregma': 1, 'status': 2}
+        self._suspend_events = 0 # > 0 while inside bulk()
+        self._events_pending = False
+        self.switching_image = False # True only while set_image fires its event
+
+    def set_image(self, project_image):
+        """ Points the model at another image's ROIs (or none), with one data-changed event """
+        self.image = project_image
+        self.data = project_image.rois if project_image else []
+        self.switching_image = True # lets listeners tell this apart from edits
+        try:
+            self.fireTableDataChanged()
+        finally:
+            self.switching_image = False
 
     def getRowCount(self):
         return len(self.data)
+
+    def fireTableChanged(self, event):
+        """ Holds back events during bulk(), they're replaced by one data-changed event at the end """
+        if self._suspend_events:
+            self._events_pending = True
+            return
+        AbstractTableModel.fireTableChanged(self, event)
+
+    @contextmanager
+    def bulk(self):
+        """ Context manager for many edits at once, listeners get a single fireTableDataChanged on exit """
+        self._suspend_events += 1
+        try:
+            yield self
+        finally:
+            self._suspend_events -= 1
+            if not self._suspend_events and self._events_pending:
+                self._events_pending = False
+                self.fireTableDataChanged()
     
     def getColumnCount(self):
         return len(self.headers)
     
     def getValueAt(self, rowIndex, columnIndex):
-        key = self.headers[columnIndex].lower().replace(" ", "_")
-        return self.data[rowIndex].get(key, "")
+        return getattr(self.data[rowIndex], self._keys[columnIndex], "")
     
     def getColumnName(self, columnIndex):
         return self.headers[columnIndex]
@@ -871,8 +1411,13 @@ class EditableROIsTableModel(AbstractTableModel):
         return True
 
     def setValueAt(self, aValue, rowIndex, columnIndex):
-        key = self.headers[columnIndex].lower().replace(" ", "_")
-        self.data[rowIndex][key] = aValue
+        key = self._keys[columnIndex]
+        if getattr(self.data[rowIndex], key, "") == aValue:
+            return # no-op edit, don't fire a change (which would flag unsaved changes)
+        if key == 'roi_name':
+            self.image.rename_roi(self.data[rowIndex], aValue) # keeps the name index in step
+        else:
+            setattr(self.data[rowIndex], key, aValue)
         # Updates data in projectImage directly
         self.fireTableCellUpdated(rowIndex, columnIndex)
 
@@ -886,6 +1431,10 @@ class QuantificationDialog(JDialog):
     modal dialog to configure setting for a batch quantification process.
     Returns selected settings to be passed to the worker class.
     """
+    # Shared by every dialog: the Fiji root never changes during a session, the models only when their folder does
+    _fiji_root = None
+    _models_cache = {} # models_dir -> (mtime, {display_name: full_path})
+
     def __init__(self, parent_frame, selected_images):
         super(QuantificationDialog, self).__init__(parent_frame, "Quantification Setting", True)
 
@@ -895,7 +1444,7 @@ class QuantificationDialog(JDialog):
 
         # Main panel
         main_panel = JPanel(BorderLayout(10,10))
-        main_panel.setBorder(EmptyBorder(15,15,15,15))
+        main_panel.setBorder(_PAD15)
         self.add(main_panel)
 
         # Info label
@@ -905,7 +1454,7 @@ class QuantificationDialog(JDialog):
 
         # Settings panel
         settings_panel = JPanel(GridLayout(0,2,10,10))
-        settings_panel.setBorder(BorderFactory.createTitledBorder("Processing Options"))
+        settings_panel.setBorder(_TB_OPTIONS)
 
         # workflow selection
         workflows = ["cFosDAB+ Detection (Generic Model)", "cFosDAB+ Detection (region specific model)"]
@@ -957,46 +1506,64 @@ class QuantificationDialog(JDialog):
         self.setVisible(True)
         return self.settings
     
-    def _get_models(self):
+    @classmethod
+    def _resolve_fiji_root(cls):
         """
-        Finds models in a dedicated folder inside Fiji's 'lib' directory.
-        This works by locating the core ImageJ .jar file
-        to determine the Fiji root directory, regardless of how
-        the application was launched.
+        Locates the core ImageJ .jar file to determine the Fiji root directory,
+        regardless of how the application was launched. Worked out once per session.
         """
+        if cls._fiji_root is not None:
+            return cls._fiji_root
+
         from java.net import URLDecoder
         from java.lang import System
 
-        MODELS_FOLDER_NAME = "cell-quantifier-toolkit-models"
-        models = {}
-        
-        try:
-            class_loader = IJ.getClassLoader()
-            if class_loader is None:
-                raise IOError("Could not get ImageJ ClassLoader.")
+        class_loader = IJ.getClassLoader()
+        if class_loader is None:
+            raise IOError("Could not get ImageJ ClassLoader.")
+
+        resource_url = class_loader.getResource("IJ_Props.txt")
+        if resource_url is None:
+            raise IOError("Could not find core resource 'IJ_Props.txt'. Is Fiji installed correctly?")
 
-            resource_url = class_loader.getResource("IJ_Props.txt")
-            if resource_url is None:
-                raise IOError("Could not find core resource 'IJ_Props.txt'. Is Fiji installed correctly?")
+        url_str = URLDecoder.decode(resource_url.toString(), "UTF-8")
+        path_part = url_str.split("!")[0].replace("jar:file:", "")
 
-            url_str = URLDecoder.decode(resource_url.toString(), "UTF-8")
-            path_part = url_str.split("!")[0].replace("jar:file:", "")
+        if System.getProperty("os.name").lower().startswith("windows") and path_part.startswith("/"):
+            path_part = path_part[1:]
 
-            if System.getProperty("os.name").lower().startswith("windows") and path_part.startswith("/"):
-                path_part = path_part[1:]
+        jar_file = File(path_part)
+        fiji_root_file = jar_file.getParentFile().getParentFile()
+        cls._fiji_root = fiji_root_file.getAbsolutePath()
+        return cls._fiji_root
 
-            jar_file = File(path_part)
-            fiji_root_file = jar_file.getParentFile().getParentFile()
-            fiji_root = fiji_root_file.getAbsolutePath()
-           
-            models_dir = os.path.join(fiji_root, "lib", MODELS_FOLDER_NAME)
+    def _get_models(self):
+        """
+        Finds models in a dedicated folder inside Fiji's 'lib' directory.
+        The listing is cached and only redone when the folder's modification time changes.
+        """
+        MODELS_FOLDER_NAME = "cell-quantifier-toolkit-models"
+        models = {}
+        
+        try:
+            models_dir = os.path.join(self._resolve_fiji_root(), "lib", MODELS_FOLDER_NAME)
 
-            if os.path.isdir(models_dir):
-                for f in os.listdir(models_dir):
+            try:
+                mtime = os.path.getmtime(models_dir)
+            except OSError:
+                mtime = None
+
+            cached = self._models_cache.get(models_dir)
+            if mtime is not None and cached is not None and cached[0] == mtime:
+                return dict(cached[1])
+
+            if mtime is not None:
+                # One directory stream; the names are all that's needed, so nothing is stat'd per entry
+                prefix = models_dir + _SEP
+                for f in _list_dir_names(models_dir):
                     if f.lower().endswith('.ilp'):
-                        display_name = os.path.splitext(f)[0]
-                        full_path = os.path.join(models_dir, f)
-                        models[display_name] = full_path
+                        models[f[:-4]] = prefix + f
+                self._models_cache[models_dir] = (mtime, dict(models))
             else:
                 IJ.log("Model directory not found. Please create it at: " + models_dir)
 
@@ -1021,17 +1588,196 @@ class ProgressDialog(JDialog):
 # Processor Classes
 #==============================================
 
+class ImageOpenWorker(SwingWorker):
+    """ Opens an image on a background thread, then builds and shows the ROIEditor for it on the GUI thread """
+    def __init__(self, parent_gui, project_image):
+        super(ImageOpenWorker, self).__init__()
+        self.parent_gui = parent_gui
+        self.project_image = project_image
+
+    def doInBackground(self):
+        return IJ.openImage(self.project_image.full_path)
+
+    def done(self):
+        """ Runs on GUI thread once the image is decoded. """
+        gui = self.parent_gui
+        try:
+            imp = self.get()
+            if imp:
+                gui.status_label.setText("Selected: {}".format(self.project_image.filename))
+                ROIEditor(gui, gui.project, self.project_image, imp).show()
+            else:
+                gui.status_label.setText("Failed to open image.")
+                IJ.error("Failed to open image:", self.project_image.full_path)
+        except Exception:
+            IJ.log(traceback.format_exc())
+            gui.status_label.setText("Error opening image. See Log for details")
+        finally:
+            gui.frame.setCursor(Cursor.getDefaultCursor())
+            gui._opening_image = None
+            gui.roi_button.setEnabled(gui.image_table.getSelectedRowCount() == 1)
+
+class _ImportResult(object):
+    """ Outcome for one imported file, published from ImportWorker to the GUI thread """
+    __slots__ = ('kind', 'value')
+
+    def __init__(self, kind, value):
+        self.kind = kind # "imported" (value is the ProjectImage), "skipped" or "error" (value is the message)
+        self.value = value
+
+class ImportWorker(SwingWorker):
+    """ Copies image files into the project on a background thread, adding each to the project on the GUI thread """
+    def __init__(self, parent_gui, source_files, progress_dialog):
+        super(ImportWorker, self).__init__()
+        self.parent_gui = parent_gui
+        self.source_files = source_files
+        self.progress_dialog = progress_dialog
+        self.images_dir = parent_gui.project.paths['images']
+        self.rois_dir = parent_gui.project.paths['rois']
+        self.newly_added_count = 0
+        self.files_done = 0
+        self.errors = [] # only touched on the GUI thread, in process()
+
+    def doInBackground(self):
+        for source_file in self.source_files:
+            dest_file = File(self.images_dir, source_file.getName())
+
+            # Check if file with name already exists
+            if dest_file.exists():
+                self.publish(_ImportResult("skipped", "{} already exists in the project".format(source_file.getName())))
+                continue
+
+            try:
+                Files.copy(source_file.toPath(), dest_file.toPath(), StandardCopyOption.REPLACE_EXISTING)
+
+                # Create projectImage object, it's added to the project in process()
+                new_image = ProjectImage(dest_file.getName(), self.images_dir, self.rois_dir)
+                new_image.status = _UNTRACKED
+                self.publish(_ImportResult("imported", new_image))
+
+            except Exception as e:
+                self.publish(_ImportResult("error", "Failed to import '{}': {}".format(source_file.getName(), e)))
+        return None
+
+    def process(self, chunks):
+        """ Runs on GUI thread with the results published since the last call. """
+        project = self.parent_gui.project
+        for result in chunks:
+            self.files_done += 1
+            if result.kind == "imported":
+                project.add_image(result.value)
+                self.parent_gui.append_image_row(result.value) # row appears as soon as its file is copied
+                self.newly_added_count += 1
+            else:
+                IJ.log(result.value)
+                if result.kind == "error":
+                    self.errors.append(result.value)
+        self.progress_dialog.progress_bar.setValue(self.files_done)
+
+    def done(self):
+        """ Runs on GUI thread after all files are copied. """
+        gui = self.parent_gui
+        try:
+            self.get()
+            if self.newly_added_count > 0:
+                gui.status_label.setText("Successfully imported {} new images.".format(self.newly_added_count))
+                gui.set_unsaved_changes(True)
+            if self.errors:
+                JOptionPane.showMessageDialog(gui.frame, "\n".join(self.errors), "Import Error", JOptionPane.ERROR_MESSAGE)
+        except Exception as e:
+            IJ.log(traceback.format_exc())
+            JOptionPane.showMessageDialog(gui.frame, "An error occurred during import:\n" + str(e), "Import Error", JOptionPane.ERROR_MESSAGE)
+        finally:
+            self.progress_dialog.dispose()
+            gui.import_button.setEnabled(True)
+
 class QuantificationWorker(SwingWorker):
     """ Processor Classs facilitating image quantification on a background thread given settings from the dialog """
-    def __init__(self, project, settings, progress_dialog):
+    def __init__(self, project, settings, progress_dialog, parent_gui=None):
         super(QuantificationWorker, self).__init__()
         self.project = project
+        self.parent_gui = parent_gui # if given, its image table is refreshed once missing ROI zips are read
         self.settings = settings
         self.progress_dialog = progress_dialog
-        self.all_results = []
+        self._show_images = settings.get('show_images', True)
+        self._prob_cache = set()
+        self._result_q = LinkedBlockingQueue() # ROI results waiting for the writer thread
+        self._write_error = None
+        self._errors = _RepeatLogger()
+        self._rt = ResultsTable() # particle measurements, reset for each ROI
 
     def doInBackground(self):
         """ This method uses a filesystem bridge to run the pixelclassifications on a background thread """
+        images_to_process = self.settings['images']
+        self.project.populate_missing_rois(images_to_process)
+        gui = self.parent_gui
+        if gui is not None:
+            def refresh_rows():
+                # The ROI counts of images read above still show "?" until their rows repaint
+                for img in images_to_process:
+                    gui.refresh_image_row(img)
+            SwingUtilities.invokeLater(refresh_rows)
+        total_rois = sum(len(img.rois) for img in images_to_process)
+        if total_rois == 0: 
+            return "No ROIs to process."
+
+        # One listing of the probabilities folder per batch; cached maps are then checked by name
+        self._prob_cache = set(_list_dir_names(self.project.paths['probabilities']))
+
+        # ilastik runs through IJ.run and reads back IJ.getImage, which is global ImageJ state, so ROIs are
+        # classified one at a time. The next image is read from disk in the background meanwhile.
+        loader = Executors.newSingleThreadExecutor()
+        finalizer = Executors.newSingleThreadExecutor() # flattens and saves finished images
+        writer = threading.Thread(target=self._write_results, name="Results writer")
+        writer.start()
+        try:
+            return self._process_images(images_to_process, total_rois, loader, finalizer)
+        finally:
+            loader.shutdownNow()
+            # Let the last processed images finish saving before the batch is reported done
+            finalizer.shutdown()
+            finalizer.awaitTermination(Long.MAX_VALUE, TimeUnit.SECONDS)
+            self._result_q.put(_END_OF_RESULTS)
+            writer.join()
+            self._errors.flush()
+
+    def _write_results(self):
+        """ Writer thread: appends ROI results to the results database in batches as they're queued """
+        batch = ArrayList()
+        batch.add(self._result_q.take())
+        if batch.get(0) is _END_OF_RESULTS:
+            return # nothing was processed, leave the database untouched
+
+        results_db_path = self.project.paths['results_db']
+        try:
+            needs_header = not os.path.isfile(results_db_path) or os.path.getsize(results_db_path) == 0
+            with open(results_db_path, 'ab', CSV_BUFSIZE) as csvfile:
+                writer = csv.writer(csvfile)
+                if needs_header:
+                    writer.writerow(_RESULTS_DB_HEADERS)
+                while True:
+                    self._result_q.drainTo(batch, 64)
+                    rows = [r for r in batch if r is not _END_OF_RESULTS]
+                    writer.writerows(rows)
+                    # Flushed per batch so the results so far survive a crash part way through
+                    _sync_to_disk(csvfile)
+                    if len(rows) < batch.size():
+                        break
+                    batch.clear()
+                    batch.add(self._result_q.take())
+        except Exception as e:
+            IJ.log(traceback.format_exc())
+            self._write_error = e
+            # Keep draining so the processing thread never waits on a dead writer
+            while not batch.contains(_END_OF_RESULTS):
+                batch.clear()
+                batch.add(self._result_q.take())
+
+    def _process_images(self, images_to_process, total_rois, loader, finalizer):
+        """
+        Runs every ROI of the given images, prefetching each next image on the loader executor
+        and handing each finished image to the finalizer executor to be flattened and saved.
+        """
 
         class UpdateProgressBarTask(Runnable):
             def __init__(self, dialog, value):
@@ -1040,63 +1786,75 @@ class QuantificationWorker(SwingWorker):
             def run(self):
                 self.dialog.progress_bar.setValue(self.value)
 
-        images_to_process = self.settings['images']
-        total_rois = sum(len(img.rois) for img in images_to_process)
-        if total_rois == 0: 
-            return "No ROIs to process."
         roi_counter = 0
+        tmp_dir = self.project.paths['temp']
+        prob_dir = self.project.paths['probabilities']
+        next_image = loader.submit(_OpenImageTask(images_to_process[0].full_path))
 
-        for image_obj in images_to_process:
+        for i, image_obj in enumerate(images_to_process):
             if self.isCancelled(): 
                 break
             
-            imp_original = IJ.openImage(image_obj.full_path)
+            imp_original = next_image.get()
+            if i + 1 < len(images_to_process):
+                next_image = loader.submit(_OpenImageTask(images_to_process[i + 1].full_path))
             imp_original_name = image_obj.filename
+            image_stem = os.path.splitext(imp_original_name)[0]
             if not imp_original:
                 raise Exception("ERROR: Failed to open original image: " + image_obj.full_path)
             
-            if self.settings.get('show_images', True):
-                imp_original.show()
-            else:
-                imp_original.close()
+            self._present(imp_original)
 
+            # Read the image's ROI zip once, each ROI below is then looked up by name. Without a zip
+            # every ROI fails the lookup on its own; an unreadable zip skips just this image's ROIs.
+            image_rois = image_obj.rois
+            rois_by_name = {}
+            if image_rois and image_obj.has_roi():
+                try:
+                    rois_by_name = _read_rois_by_name(_get_thread_roi_manager(), image_obj.roi_path)
+                except Exception as e:
+                    self._errors.log(str(e), "ERROR reading ROI file for '{}': {}".format(imp_original_name, e))
+                    roi_counter += len(image_rois)
+                    image_rois = []
+                    SwingUtilities.invokeLater(UpdateProgressBarTask(self.progress_dialog, int(100.0 * roi_counter / total_rois)))
 
             # This inner loop defines 'roi_data' for each ROI in the current image
-            for roi_data in image_obj.rois:
+            for roi_data in image_rois:
                 if self.isCancelled(): 
                     break
                 
-                roi_name = roi_data['roi_name']
+                roi_name = roi_data.roi_name
                 temp_cropped_path = None # Define here for the finally block
                 
                 try:
-                    rm = RoiManager(True)
-                    rm.open(image_obj.roi_path)
-                    roi = rm.getRoi(rm.getIndex(roi_name))
-                    rm.close()
+                    roi = rois_by_name.get(roi_name)
                     if not roi:
                         raise Exception("Could not find ROI '" + roi_name + "' in the ROI file.")
 
                     # Get bounding box coordinates
-                    roi_x = roi.getBounds().x
-                    roi_y = roi.getBounds().y
+                    bounds = roi.getBounds()
+                    roi_x = bounds.x
+                    roi_y = bounds.y
 
                     roi_for_analysis = roi.clone()
 
-                    imp_cropped = imp_original.duplicate()
-                    imp_cropped.setRoi(roi_for_analysis)
-                    IJ.run(imp_cropped, "Crop", "")
-                    
                     # set up the file paths we need and save a temp version of the cropped image
-                    base_name = "{}_{}".format(os.path.splitext(image_obj.filename)[0], roi_data['roi_name'])
-                    temp_cropped_path = os.path.join(self.project.paths['temp'], base_name + "_cropped.tif")
-                    prob_map_path = os.path.join(self.project.paths['probabilities'], base_name)
-                    IJ.saveAs(imp_cropped, "Tiff", temp_cropped_path)
+                    base_name = "{}_{}".format(image_stem, roi_name)
 
-                    if self.settings.get('show_images', True):
-                        imp_cropped.show()
-                    else:
-                        imp_cropped.close()
+                    # Copy only the ROI's bounding box out of the original, not the whole image
+                    ip = imp_original.getProcessor()
+                    ip.setRoi(bounds)
+                    imp_cropped = ImagePlus(base_name, ip.crop())
+                    ip.resetRoi()
+                    imp_cropped.setCalibration(imp_original.getCalibration())
+
+                    temp_cropped_path = os.path.join(tmp_dir, base_name + "_cropped.tif")
+                    prob_map_path = os.path.join(prob_dir, base_name)
+                    # Written with FileSaver directly, the temp file needs none of IJ.saveAs's format lookup or bookkeeping
+                    if not FileSaver(imp_cropped).saveAsTiff(temp_cropped_path):
+                        raise Exception("Could not write temporary crop " + temp_cropped_path)
+
+                    self._present(imp_cropped)
 
                     # Run ilastik classification 
                     result_imp = self._run_ilastik_classification(roi_for_analysis, temp_cropped_path, imp_original_name, prob_map_path)
@@ -1104,16 +1862,17 @@ class QuantificationWorker(SwingWorker):
                     # Process and analyze in fiji
                     analysis = self._analyze_results(result_imp, roi_for_analysis, roi_x, roi_y)
 
-                    single_roi_result = {
-                        'filename': image_obj.filename,
-                        'roi_name': roi_data['roi_name'],
-                        'roi_area': roi.getStatistics().area, # Get area of the main analysis ROI
-                        'brema_value': roi_data.get('bregma', 'N/A'),
-                        'cell_count': analysis['count'],
-                        'total_cell_area': analysis['total area']
-                    }
-                    # Add this result to the master list that will be saved later
-                    self.all_results.append(single_roi_result)
+                    # One results database row, in _RESULTS_DB_HEADERS order
+                    single_roi_result = (
+                        image_obj.filename,
+                        roi_data.roi_name,
+                        roi.getStatistics().area, # Get area of the main analysis ROI
+                        roi_data.bregma,
+                        analysis['count'],
+                        analysis['total area']
+                    )
+                    # Hand the result to the writer thread, which appends it to the results database
+                    self._result_q.put(single_roi_result)
 
                     particle_outlines = analysis.get('outlines', [])
 
@@ -1125,20 +1884,15 @@ class QuantificationWorker(SwingWorker):
                             overlay = Overlay()
                             imp_original.setOverlay(overlay)
 
+                        # No redraw here, the overlay is flattened into a new image once all ROIs are done
                         for outline_roi in outlines_to_add:
                             overlay.add(outline_roi)
-                        imp_original.updateAndDraw()   
-
-                        if self.settings.get('show_images', True):
-                            imp_original.show()
-                        else:
-                            imp_original.close()
 
                     else:
                         print("fail")
 
                 except Exception as e:
-                    IJ.log("ERROR processing ROI '{}' in '{}': {}".format(roi_name, image_obj.filename, e))
+                    self._errors.log(str(e), "ERROR processing ROI '{}' in '{}': {}".format(roi_name, image_obj.filename, e))
                     continue 
 
                 finally:
@@ -1146,146 +1900,148 @@ class QuantificationWorker(SwingWorker):
                         try:
                             os.remove(temp_cropped_path)
                         except Exception as ex:
-                            IJ.log("Warning: Could not delete temporary file " + temp_cropped_path)
+                            self._errors.log("temp file not deleted", "Warning: Could not delete temporary file " + temp_cropped_path)
                     
                     roi_counter += 1
                     progress = int(100.0 * roi_counter / total_rois)
                     update_task = UpdateProgressBarTask(self.progress_dialog, progress)
                     SwingUtilities.invokeLater(update_task)
             
-            if imp_original:
-                export_path = os.path.join(self.project.paths['processed'], os.path.splitext(imp_original_name)[0] + "_processed.tiff")
-                
-                image_to_save = None
-                
-                # Check if an overlay exists to be flattened
-                if imp_original.getOverlay():
-                    IJ.log("Flattening overlay for " + imp_original_name)
-                    # flatten() creates a NEW image with the overlay burned in.
-                    image_to_save = imp_original.flatten()
-                else:
-                    # No overlay, so we will just save the original.
-                    image_to_save = imp_original
-
-                # Save the designated image (either the new flattened one or the original).
-                IJ.saveAs(image_to_save, "Tiff", export_path)
-
-                # Manage windows based on user settings.
-                if self.settings.get('show_images', True):
-                    image_to_save.show() # Show the final result.
-                    # If we created a new flattened image, close the old one with the interactive overlay.
-                    if image_to_save is not imp_original:
-                        imp_original.close()
-                else:
-                    # If not showing images, clean up everything.
-                    image_to_save.close()
-                    if image_to_save is not imp_original:
-                        imp_original.close()
-                    
+            if self._show_images:
+                # Showing the result changes ImageJ's current image, which ilastik's output is read
+                # back through, so with windows on this stays in step with the ROI processing
+                self._finalize_image(imp_original, imp_original_name)
+            else:
+                # Flattening and saving happen in the background while the next image is processed
+                finalizer.submit(_FinalizeImageTask(self, imp_original, imp_original_name))
+
         return "Batch processing complete. {} ROIs processed.".format(roi_counter)
     
+    def _finalize_image(self, imp_original, imp_original_name):
+        """ Flattens an image's outlines overlay and saves it to the processed folder, then tidies its windows """
+        try:
+            export_path = os.path.join(self.project.paths['processed'], os.path.splitext(imp_original_name)[0] + "_processed.tiff")
+
+            image_to_save = None
+
+            # Check if an overlay exists to be flattened
+            if imp_original.getOverlay():
+                IJ.log("Flattening overlay for " + imp_original_name)
+                # flatten() creates a NEW image with the overlay burned in.
+                image_to_save = imp_original.flatten()
+            else:
+                # No overlay, so we will just save the original.
+                image_to_save = imp_original
+
+            # Save the designated image (either the new flattened one or the original).
+            IJ.saveAs(image_to_save, "Tiff", export_path)
+
+            # Manage windows based on user settings.
+            if self._show_images:
+                self._present(image_to_save) # Show the final result.
+                # If we created a new flattened image, close the old one with the interactive overlay.
+                if image_to_save is not imp_original:
+                    imp_original.close()
+            else:
+                # If not showing images, clean up everything.
+                image_to_save.close()
+                if image_to_save is not imp_original:
+                    imp_original.close()
+        except Exception as e:
+            self._errors.log(str(e), "ERROR saving processed image '{}': {}".format(imp_original_name, e))
+
+    def _present(self, imp):
+        """ Shows an image if the user asked to see images and it isn't already in a window """
+        if self._show_images and imp.getWindow() is None:
+            imp.show()
+
     def _run_ilastik_classification(self, roi, temp_cropped_path, img_name, prob_map_path):
         """ Segment input image using two step ilastik workflow. Generate proability maps with pixel classification workflow,
             save those results, and then generate object maps with object classifcation workflow."""
         try:
-            pixel_classifier = self.settings['pixel_classifier']
-            object_classifer = self.settings['object_classifier']
-
             pixel_prob_path = prob_map_path + "_probabilities.tif"
             object_prob_path = prob_map_path + "_objects.tif"
-            
-            # Run pixel classification
-            if os.path.exists(object_prob_path):
-                result_imp = IJ.openImage(object_prob_path)
-                if self.settings.get('show_images', True):
-                    result_imp.show()
 
-            
-            elif os.path.exists(pixel_prob_path):
-                result_imp = IJ.openImage(pixel_prob_path)
-                if self.settings.get('show_images', True):
-                    result_imp.show()
-
-                # Run Object classification with generated probability map
-                object_macro_cmd = 'run("Run Object Classification Prediction", "projectfilename=[{}] rawinputimage=[{}] inputproborsegimage=[{}] secondinputtype=Probabilities ");'.format(object_classifer,temp_cropped_path, pixel_prob_path)
-                IJ.runMacro(object_macro_cmd)
-
-                result_imp = IJ.getImage()
-                if result_imp:
-                    IJ.saveAs(result_imp, "Tiff", object_prob_path)
-                    if self.settings.get('show_images', True):
-                        result_imp.show()
-                else:
-                    raise Exception("No probability map output from ilastik object classifier.")
+            # Object map already made on an earlier run
+            if os.path.basename(object_prob_path) in self._prob_cache:
+                result_imp = IJ.openImage(object_prob_path)
+                self._present(result_imp)
+                return result_imp
 
+            # Run pixel classification, unless its probability map is already saved
+            if os.path.basename(pixel_prob_path) in self._prob_cache:
+                if self._show_images:
+                    self._present(IJ.openImage(pixel_prob_path))
             else:
-                pixel_macro_cmd = 'run("Run Pixel Classification Prediction", "projectfilename=[{}] inputimage=[{}] pixelclassificationtype=Probabilities");'.format(pixel_classifier, temp_cropped_path)
-                IJ.runMacro(pixel_macro_cmd)
-
-                result_imp = IJ.getImage()
-                if result_imp:
-                    IJ.saveAs(result_imp, "Tiff", pixel_prob_path)
-                    if self.settings.get('show_images', True):
-                        result_imp.show()
-                else:
-                    raise Exception("No probability map output from ilastik pixel classifier.")
-            
-                # Run Object classification with generated probability map
-                object_macro_cmd = 'run("Run Object Classification Prediction", "projectfilename=[{}] rawinputimage=[{}] inputproborsegimage=[{}] secondinputtype=Probabilities ");'.format(object_classifer,temp_cropped_path, pixel_prob_path)
-                IJ.runMacro(object_macro_cmd)
-
-                result_imp = IJ.getImage()
-                if result_imp:
-                    IJ.saveAs(result_imp, "Tiff", object_prob_path)
-                    if self.settings.get('show_images', True):
-                        result_imp.show()
-                else:
-                    raise Exception("No probability map output from ilastik object classifier.")
+                self._run_ilastik(_ILASTIK_PIXEL_CMD, "projectfilename=[{}] inputimage=[{}] pixelclassificationtype=Probabilities".format(
+                    self.settings['pixel_classifier'], temp_cropped_path), pixel_prob_path, "pixel")
+
+            # Run Object classification with generated probability map
+            return self._run_ilastik(_ILASTIK_OBJECT_CMD, "projectfilename=[{}] rawinputimage=[{}] inputproborsegimage=[{}] secondinputtype=Probabilities".format(
+                self.settings['object_classifier'], temp_cropped_path, pixel_prob_path), object_prob_path, "object")
 
-            return result_imp
-            
         except Exception as e:
-            IJ.log("ilastik processing failed: " + str(e))
+            self._errors.log("ilastik: " + str(e), "ilastik processing failed: " + str(e))
             raise e
 
+    def _run_ilastik(self, command, options, save_path, classifier_kind):
+        """
+        Runs one ilastik prediction command and saves the image it outputs. The command is dispatched
+        with IJ.run, which skips compiling a one-line macro around it; the output is ilastik's new current image.
+        """
+        IJ.run(command, options)
+        result_imp = IJ.getImage()
+        if not result_imp:
+            raise Exception("No probability map output from ilastik {} classifier.".format(classifier_kind))
+        if not FileSaver(result_imp).saveAsTiff(save_path):
+            raise Exception("Could not save ilastik {} output to {}".format(classifier_kind, save_path))
+        self._prob_cache.add(os.path.basename(save_path))
+        self._present(result_imp)
+        return result_imp
+
     def _analyze_results(self, result_imp, roi, offset_x, offset_y):
         """ final processing and analysis of ilastik output in fiji. creates selection of points in roi manager. """
-        IJ.run("Clear Results")
-
-        # Threshold to select dark and light cells
-        IJ.setThreshold(result_imp, 1, 3)
-        IJ.run(result_imp, "Convert to Mask", "")
+        # Threshold to select dark and light cells, building the mask in one pass (cells are 255)
+        ip = result_imp.getProcessor()
+        ip.setThreshold(1, 3, ImageProcessor.NO_LUT_UPDATE)
+        mask = ip.createMask()
+        if not Prefs.blackBackground:
+            mask.invertLut() # display it the way "Convert to Mask" would, so particles are still read as 255
 
         # watershed to split any cells that were merged
-        IJ.run(result_imp, "Watershed", "")
+        EDM().toWatershed(mask)
+        result_imp.setProcessor(mask)
         
-        #select only roi
-        rm = RoiManager(True)
+        # The thread's hidden RoiManager and the worker's ResultsTable are reused for every ROI,
+        # which also leaves the user's own Results table alone
+        rm = _get_thread_roi_manager()
+        rm.reset()
+        rt = self._rt
+        rt.reset()
 
-        # Set up and run the ParticleAnalyzer programmatically
-        rt = ResultsTable()
-        options = ParticleAnalyzer.SHOW_OUTLINES | ParticleAnalyzer.EXCLUDE_EDGE_PARTICLES
+        # Set up and run the ParticleAnalyzer programmatically, with the same settings the
+        # "Analyze Particles..." command used: size=0-Infinity circularity=0.00-1.00 show=Nothing clear add
+        options = ParticleAnalyzer.ADD_TO_MANAGER | ParticleAnalyzer.CLEAR_WORKSHEET
         measurements = Measurements.AREA | Measurements.CENTER_OF_MASS 
 
         # Instantiate the analyzer
         pa = ParticleAnalyzer(options, measurements, rt, 0, float('inf'), 0.0, 1.0)
-        pa.setRoiManager(rm)
+        ParticleAnalyzer.setRoiManager(rm) # picked up by the next analyze()
 
         roi_clone_for_analysis = roi.clone()
         roi_clone_for_analysis.setLocation(0, 0) # Move the clone to the top-left.
         result_imp.setRoi(roi_clone_for_analysis)
 
         # Run analyze particles
-        args = "size=0-Infinity circularity=0.00-1.00 show=Nothing clear add"
-        IJ.run(result_imp, "Analyze Particles...", args)
+        pa.analyze(result_imp)
 
         # get stats
-        rt = ResultsTable.getResultsTable()
         count = rt.getCounter()
         total_area = 0
-        area_col = rt.getColumn(rt.getColumnIndex("Area"))
-        if area_col:
-            total_area = sum(area_col)
+        area_index = rt.getColumnIndex("Area")
+        if area_index != ResultsTable.COLUMN_NOT_FOUND and count:
+            # Summed in Java, a Python sum() would box every value of the double[]
+            total_area = Arrays.stream(rt.getColumnAsDoubles(area_index)).sum()
 
         # Get particle oulines
         particle_outlines_relative = rm.getRoisAsArray()
@@ -1312,19 +2068,12 @@ class QuantificationWorker(SwingWorker):
     def done(self):
         """ Runs on GUI thread after background work is finished. """
         try:
-            # Save all collected results to the database
-            if self.all_results:
-                results_db_path = self.project.paths['results_db']
-                headers = ['filename', 'roi_name', 'roi_area', 'brema_value', 'cell_count', 'total_cell_area' ]
-                file_exists = os.path.isfile(results_db_path)
-                with open(results_db_path, 'ab') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=headers)
-                    if not file_exists or os.path.getsize(results_db_path) == 0: 
-                        writer.writeheader()
-                    writer.writerows(self.all_results)
-            
-            # Show final status message
+            # Results were written to the database as they came in, by the writer thread
             final_message = self.get()
+            if self._write_error is not None:
+                raise self._write_error
+
+            # Show final status message
             JOptionPane.showMessageDialog(self.progress_dialog, final_message, "Status", JOptionPane.INFORMATION_MESSAGE)
         except Exception as e:
             IJ.log(traceback.format_exc())